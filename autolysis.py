@@ -1,13 +1,209 @@
 import os
 import sys
+import json
+import codecs
+import pathlib
+import tempfile
+import warnings
+import contextlib
 import pandas as pd
 import numpy as np
-import seaborn as sns
-import matplotlib.pyplot as plt
-from typing import Dict, Any
-import requests
-from tenacity import retry, stop_after_attempt, wait_exponential
-import chardet
+from typing import Dict, Any, List, Optional, Tuple
+
+# Prefer the C implementation of chardet when it is installed
+try:
+    import cchardet as _chardet
+except ImportError:
+    import chardet as _chardet
+
+# fcntl serializes updates to the encoding cache; it is not available on Windows
+try:
+    import fcntl
+except ImportError:
+    fcntl = None
+
+# pyarrow's multi-threaded CSV parser is used when it is installed
+try:
+    import pyarrow as pa
+    import pyarrow.csv as pa_csv
+except ImportError:
+    pa = None
+    pa_csv = None
+
+# numba parallelizes outlier detection across columns when it is installed.
+# It is slow to import, so it is only loaded the first time it is needed.
+numba = None
+_iqr_kernel = None
+
+# Minimum number of numeric columns before outlier detection uses the numba
+# kernel; compiling it takes seconds and the NumPy path is faster on narrow frames
+NUMBA_MIN_COLUMNS = 200
+
+# Number of bytes read from the start of the file for encoding detection
+ENCODING_SAMPLE_SIZE = 64 * 1024
+
+# On-disk cache of detected encodings and column types, keyed by file path,
+# mtime and size
+ENCODING_CACHE_PATH = os.path.join(
+    os.path.expanduser("~"), ".cache", "autolysis", "encodings.json"
+)
+
+# Numeric columns are downcast to float32 during analysis only while every
+# column's largest absolute value stays below 2**24, above which float32 can
+# no longer hold every integer exactly, and within this multiple of its
+# standard deviation; float32 keeps only ~7 significant digits, so a larger
+# ratio quantizes away the column's spread
+FLOAT32_MAX_MAGNITUDE = 2 ** 24
+FLOAT32_MAX_MAGNITUDE_TO_STD = 1e3
+
+# Minimum fraction of NaN-free rows for correlations to drop incomplete rows
+# instead of falling back to pandas' slower pairwise computation
+CORRELATION_MIN_COMPLETE_ROWS = 0.9
+
+# Connect and read timeouts in seconds for AI Proxy requests
+API_TIMEOUT = (10, 120)
+
+# Maximum number of correlation pairs and outlier columns described in the prompt
+PROMPT_TOP_K = 20
+
+# Number of rows read when only column types are needed
+COLUMN_TYPE_SAMPLE_ROWS = 10000
+
+# Maximum number of rows drawn in the boxplot and histogram
+PLOT_SAMPLE_SIZE = 10000
+
+
+def _load_encoding_cache() -> Dict[str, Any]:
+    """
+    Load the encoding cache, returning an empty cache if it is missing or unreadable
+    """
+    try:
+        with open(ENCODING_CACHE_PATH, 'r', encoding='utf-8') as f:
+            cache = json.load(f)
+        return cache if isinstance(cache, dict) else {}
+    except (OSError, ValueError):
+        return {}
+
+
+@contextlib.contextmanager
+def _encoding_cache_lock():
+    """
+    Hold an exclusive lock on the encoding cache so concurrent runs do not
+    lose each other's updates. Without fcntl (Windows) the cache is left
+    unlocked and overlapping runs may drop entries.
+    """
+    if fcntl is None:
+        yield
+        return
+    with open(ENCODING_CACHE_PATH + '.lock', 'w') as lock_file:
+        fcntl.flock(lock_file, fcntl.LOCK_EX)
+        try:
+            yield
+        finally:
+            fcntl.flock(lock_file, fcntl.LOCK_UN)
+
+
+def _update_encoding_cache(path: str, cache_key: str, entry: Dict[str, Any]):
+    """
+    Store the entry for a file, dropping entries for older versions of it
+    """
+    try:
+        os.makedirs(os.path.dirname(ENCODING_CACHE_PATH), exist_ok=True)
+        with _encoding_cache_lock():
+            # Re-read under the lock so updates from other runs are kept
+            cache = {
+                key: value for key, value in _load_encoding_cache().items()
+                if key.rsplit(':', 2)[0] != path
+            }
+            cache[cache_key] = entry
+            _save_encoding_cache(cache)
+    except OSError as e:
+        print(f"Could not update encoding cache: {e}")
+
+
+def _save_encoding_cache(cache: Dict[str, Any]):
+    """
+    Write the encoding cache atomically so concurrent runs never see a partial file
+    """
+    cache_dir = os.path.dirname(ENCODING_CACHE_PATH)
+    try:
+        os.makedirs(cache_dir, exist_ok=True)
+        fd, tmp_path = tempfile.mkstemp(dir=cache_dir, suffix='.tmp')
+        try:
+            with os.fdopen(fd, 'w', encoding='utf-8') as f:
+                json.dump(cache, f)
+            os.replace(tmp_path, ENCODING_CACHE_PATH)
+        except BaseException:
+            os.unlink(tmp_path)
+            raise
+    except OSError as e:
+        print(f"Could not update encoding cache: {e}")
+
+
+def _dtype_hints(df: pd.DataFrame) -> Dict[str, str]:
+    """
+    Collect the numeric and boolean column types of a parsed CSV so later reads
+    of the same file can skip type inference
+    """
+    return {
+        str(col): str(dtype) for col, dtype in df.dtypes.items()
+        if pd.api.types.is_numeric_dtype(dtype) and isinstance(dtype, np.dtype)
+    }
+
+
+def _probe_decode(raw_data: bytes, encoding: str) -> bool:
+    """
+    Check whether a sample of bytes decodes cleanly with the given encoding
+    """
+    try:
+        # An incremental decoder tolerates a multi-byte sequence cut off at the sample end
+        codecs.getincrementaldecoder(encoding)(errors='strict').decode(raw_data, final=False)
+        return True
+    except (UnicodeError, LookupError):
+        return False
+
+
+def _iqr_outlier_counts(arr):
+    """
+    Compute Q1, Q3 and the IQR outlier count of each column, ignoring NaNs.
+    Compiled with numba by _get_iqr_kernel.
+    """
+    n_cols = arr.shape[1]
+    q1 = np.full(n_cols, np.nan)
+    q3 = np.full(n_cols, np.nan)
+    counts = np.zeros(n_cols, dtype=np.int64)
+    for j in numba.prange(n_cols):
+        col = arr[:, j]
+        valid = col[~np.isnan(col)]
+        if valid.size == 0:
+            continue
+        q1[j] = np.quantile(valid, 0.25)
+        q3[j] = np.quantile(valid, 0.75)
+        iqr = q3[j] - q1[j]
+        lower_bound = q1[j] - 1.5 * iqr
+        upper_bound = q3[j] + 1.5 * iqr
+        count = 0
+        for value in valid:
+            if value < lower_bound or value > upper_bound:
+                count += 1
+        counts[j] = count
+    return q1, q3, counts
+
+
+def _get_iqr_kernel():
+    """
+    Import numba and compile the outlier kernel on first use, returning None
+    if numba is not installed
+    """
+    global numba, _iqr_kernel
+    if _iqr_kernel is None:
+        try:
+            import numba
+        except ImportError:
+            return None
+        _iqr_kernel = numba.njit(parallel=True, cache=True)(_iqr_outlier_counts)
+    return _iqr_kernel
+
 
 class DataAnalyzer:
     def __init__(self, csv_path: str):
@@ -15,16 +211,58 @@ class DataAnalyzer:
         Initialize the data analyzer with a CSV file
         """
         self.csv_path = csv_path
-        self.df = self._read_csv_robust()
-        self.dataset_name = os.path.splitext(os.path.basename(csv_path))[0]
+        # The full file is only read when an analysis first needs it
+        self._df = None
+        self._dtypes = None
+        # Stat the file once; the result keys the read cache and sizes the encoding sample
+        self._path = pathlib.Path(csv_path).resolve()
+        self._stat = self._path.stat()
+        self.dataset_name = pathlib.Path(csv_path).stem
         
         # AI Proxy configuration
         self.api_key = os.environ.get("AIPROXY_TOKEN", "")
         self.base_url = "https://aiproxy.sanand.workers.dev/openai/"
+
+        self._session = None
     
-    def _read_csv_robust(self) -> pd.DataFrame:
+    def _get_session(self):
+        """
+        Create the HTTP session on first use; one keep-alive connection is reused
+        for all API calls and transient failures are retried
         """
-        Robustly read CSV file with multiple encoding detection strategies
+        if self._session is None:
+            import requests
+            from requests.adapters import HTTPAdapter
+            from urllib3.util.retry import Retry
+
+            self._session = requests.Session()
+            self._session.headers.update({
+                "Content-Type": "application/json",
+                "Authorization": f"Bearer {self.api_key}"
+            })
+            retries = Retry(total=3, backoff_factor=2,
+                            status_forcelist=[429, 500, 502, 503, 504],
+                            allowed_methods=["POST"])
+            self._session.mount("https://", HTTPAdapter(max_retries=retries))
+        return self._session
+
+    @property
+    def df(self) -> pd.DataFrame:
+        """
+        Full dataset, loaded on first access
+        """
+        if self._df is None:
+            self._df = self._read_csv_robust()
+        return self._df
+
+    @df.setter
+    def df(self, value: pd.DataFrame):
+        self._df = value
+
+    def _read_csv_robust(self, sample_only: bool = False) -> pd.DataFrame:
+        """
+        Robustly read CSV file with multiple encoding detection strategies.
+        With sample_only, only the first rows are read for type inference.
         """
         # List of encodings to try
         encodings_to_try = [
@@ -36,21 +274,53 @@ class DataAnalyzer:
             'ascii'
         ]
 
-        # First, try to detect encoding using chardet
-        with open(self.csv_path, 'rb') as file:
-            raw_data = file.read()
-            detected_encoding = chardet.detect(raw_data)['encoding']
+        # Reuse the encoding and column types found on a previous run of the same file
+        cache_key = f"{self._path}:{self._stat.st_mtime_ns}:{self._stat.st_size}"
+        cache_entry = _load_encoding_cache().get(cache_key) or {}
+        if isinstance(cache_entry, str):
+            # Entries written before column types were cached hold only the encoding
+            cache_entry = {"encoding": cache_entry}
+        cached_encoding = cache_entry.get("encoding")
+        detected_encoding = cached_encoding
+
+        # Read a sample of the file for detection and encoding checks
+        with open(self._path, 'rb') as file:
+            raw_data = file.read(min(self._stat.st_size, ENCODING_SAMPLE_SIZE))
+
+        if detected_encoding is None:
+            # A byte order mark settles the encoding without running chardet
+            if raw_data[:3] == b'\xef\xbb\xbf':
+                detected_encoding = 'utf-8-sig'
+            elif raw_data[:2] in (b'\xff\xfe', b'\xfe\xff'):
+                detected_encoding = 'utf-16'
+            else:
+                detected_encoding = _chardet.detect(raw_data)['encoding']
+        if detected_encoding:
             encodings_to_try.insert(0, detected_encoding)
 
         # Remove duplicates while preserving order
         encodings_to_try = list(dict.fromkeys(encodings_to_try))
 
+        # Skip encodings that cannot even decode the sample before running a full parse
+        encodings_to_try = [e for e in encodings_to_try if _probe_decode(raw_data, e)]
+
         # Try reading with different encodings
         for encoding in encodings_to_try:
             try:
                 # Try reading with the current encoding
-                df = pd.read_csv(self.csv_path, encoding=encoding, low_memory=False)
+                if sample_only:
+                    df = pd.read_csv(self.csv_path, encoding=encoding,
+                                     nrows=COLUMN_TYPE_SAMPLE_ROWS, low_memory=False)
+                    print(f"Successfully read CSV sample with {encoding} encoding")
+                    return df
+
+                # Cached column types only describe the file as read with the cached encoding
+                dtypes = cache_entry.get("dtypes") if encoding == cached_encoding else None
+                df = self._read_csv_full(encoding, dtypes)
                 print(f"Successfully read CSV with {encoding} encoding")
+                new_entry = {"encoding": encoding, "dtypes": _dtype_hints(df)}
+                if cache_entry != new_entry:
+                    _update_encoding_cache(str(self._path), cache_key, new_entry)
                 return df
             except (UnicodeDecodeError, pd.errors.ParserError) as e:
                 print(f"Failed to read with {encoding} encoding: {e}")
@@ -59,11 +329,80 @@ class DataAnalyzer:
         # If all encodings fail, raise an error
         raise ValueError(f"Could not read the CSV file with any of the tried encodings. "
                          f"Tried: {', '.join(encodings_to_try)}")
+
+    def _read_csv_full(self, encoding: str, dtypes: Optional[Dict[str, str]] = None) -> pd.DataFrame:
+        """
+        Read the whole CSV with pyarrow if possible, otherwise with pandas.
+        Known column types skip type inference.
+        """
+        df = self._read_csv_pyarrow(encoding, dtypes)
+        if df is not None:
+            return df
+        try:
+            return pd.read_csv(self.csv_path, encoding=encoding, dtype=dtypes, low_memory=False)
+        except (ValueError, TypeError) as e:
+            if dtypes is None or isinstance(e, UnicodeDecodeError):
+                raise
+            print(f"Cached column types do not apply, inferring them again: {e}")
+            return pd.read_csv(self.csv_path, encoding=encoding, low_memory=False)
+
+    def _read_csv_pyarrow(self, encoding: str,
+                          dtypes: Optional[Dict[str, str]] = None) -> Optional[pd.DataFrame]:
+        """
+        Read the CSV with pyarrow, returning None if pyarrow is unavailable or cannot parse it
+        """
+        if pa_csv is None:
+            return None
+        column_types = {
+            col: pa.from_numpy_dtype(np.dtype(dtype)) for col, dtype in (dtypes or {}).items()
+        }
+        read_options = pa_csv.ReadOptions(encoding=encoding, use_threads=True)
+        try:
+            table = pa_csv.read_csv(
+                self.csv_path,
+                read_options=read_options,
+                # Treat empty strings as missing, as pd.read_csv does
+                convert_options=pa_csv.ConvertOptions(strings_can_be_null=True,
+                                                      column_types=column_types)
+            )
+            if len(set(table.column_names)) < len(table.column_names):
+                # pandas renames duplicate headers (a, a.1); pyarrow keeps them as is
+                return None
+
+            # pd.read_csv leaves dates and times as text, so read them as strings too
+            temporal = [field.name for field in table.schema if pa.types.is_temporal(field.type)]
+            if temporal:
+                column_types.update({name: pa.string() for name in temporal})
+                table = pa_csv.read_csv(
+                    self.csv_path,
+                    read_options=read_options,
+                    convert_options=pa_csv.ConvertOptions(strings_can_be_null=True,
+                                                          column_types=column_types)
+                )
+        except UnicodeDecodeError:
+            raise
+        except (pa.ArrowException, ValueError) as e:
+            print(f"pyarrow could not parse CSV with {encoding} encoding, using pandas: {e}")
+            return None
+
+        # pyarrow keeps undecodable text as binary columns instead of raising
+        if any(pa.types.is_binary(field.type) or pa.types.is_large_binary(field.type)
+               for field in table.schema):
+            return None
+        return table.to_pandas(self_destruct=True)
     
     def analyze_dataset(self) -> Dict[str, Any]:
         """
         Perform comprehensive dataset analysis
         """
+        # Coerce numeric-looking columns first so every analyzer sees them
+        self._convert_numeric_columns()
+
+        # Scan the dataframe once and share the results across analyzers
+        self._numeric_df = self._build_numeric_frame()
+        self._nulls = self._count_nulls()
+        self._dtypes = self.df.dtypes.astype(str).to_dict()
+
         analysis = {
             "basic_stats": self._get_basic_statistics(),
             "missing_values": self._analyze_missing_values(),
@@ -73,131 +412,317 @@ class DataAnalyzer:
         }
         return analysis
     
-    def _get_basic_statistics(self) -> Dict[str, Any]:
+    def _convert_numeric_columns(self):
         """
-        Compute basic statistical summary
+        Convert text columns that hold numeric values to numeric dtype
         """
-        # Convert columns to numeric, coercing errors
-        numeric_cols = self.df.select_dtypes(include=[np.number]).columns.tolist()
-        
+        # Only text columns can hold numbers stored as strings; converting
+        # datetime or boolean columns would turn them into raw integers
+        text_cols = [
+            col for col, dtype in self.df.dtypes.items()
+            if pd.api.types.is_object_dtype(dtype) or pd.api.types.is_string_dtype(dtype)
+        ]
+
         # Try to convert more columns to numeric
-        for col in self.df.columns:
+        for col in text_cols:
+            # Check a sample first so text columns are not scanned in full
+            sample = self.df[col].dropna().head(1000)
+            if sample.empty:
+                continue
             try:
-                self.df[col] = pd.to_numeric(self.df[col], errors='coerce')
-                if not self.df[col].isna().all():
-                    numeric_cols.append(col)
-            except:
-                pass
-        
-        # Remove duplicates
-        numeric_cols = list(set(numeric_cols))
-        
+                pd.to_numeric(sample, errors='raise')
+            except (ValueError, TypeError):
+                continue
+            self.df[col] = pd.to_numeric(self.df[col], errors='coerce')
+
+    def _build_numeric_frame(self) -> pd.DataFrame:
+        """
+        Build the numeric block shared by the analyzers, downcast to float32
+        unless that would lose too much precision
+        """
+        numeric_df = self.df.select_dtypes(include=[np.number])
+        values = numeric_df.to_numpy(dtype=np.float64, na_value=np.nan)
+        if values.size:
+            with warnings.catch_warnings():
+                # All-NaN columns give NaN here and never block the downcast
+                warnings.simplefilter('ignore', RuntimeWarning)
+                magnitude = np.nanmax(np.abs(values), axis=0)
+                spread = np.nanstd(values, axis=0)
+            # Constant columns have no spread to lose, but large values still round
+            too_precise = ((magnitude > FLOAT32_MAX_MAGNITUDE)
+                           | ((spread > 0) & (magnitude > FLOAT32_MAX_MAGNITUDE_TO_STD * spread)))
+            if too_precise.any():
+                return pd.DataFrame(values, index=numeric_df.index, columns=numeric_df.columns)
+        return pd.DataFrame(values.astype(np.float32), index=numeric_df.index,
+                            columns=numeric_df.columns)
+
+    def _get_basic_statistics(self) -> Dict[str, Any]:
+        """
+        Compute basic statistical summary
+        """
+        numeric_cols = self._numeric_df.columns.tolist()
+
         return {
             "total_rows": len(self.df),
             "total_columns": len(self.df.columns),
             "numeric_columns": numeric_cols,
-            "summary": self.df[numeric_cols].describe().to_dict() if numeric_cols else {}
+            "summary": self._summarize_numeric() if numeric_cols else {}
+        }
+
+    def _summarize_numeric(self) -> Dict[str, Dict[str, float]]:
+        """
+        Compute the same statistics as DataFrame.describe in a single NumPy pass,
+        sharing one sort across all percentiles
+        """
+        arr = self._numeric_df.to_numpy()
+        with warnings.catch_warnings():
+            # All-NaN columns yield NaN statistics, as describe() does
+            warnings.simplefilter('ignore', RuntimeWarning)
+            counts = (~np.isnan(arr)).sum(axis=0)
+            means = np.nanmean(arr, axis=0, dtype=np.float64)
+            stds = np.nanstd(arr, axis=0, dtype=np.float64, ddof=1)
+            pcts = np.nanpercentile(arr, [0, 25, 50, 75, 100], axis=0)
+
+        stats = {
+            "count": counts, "mean": means, "std": stds,
+            "min": pcts[0], "25%": pcts[1], "50%": pcts[2], "75%": pcts[3], "max": pcts[4]
+        }
+        return {
+            col: {name: float(values[i]) for name, values in stats.items()}
+            for i, col in enumerate(self._numeric_df.columns)
         }
     
     def _analyze_missing_values(self) -> Dict[str, float]:
         """
         Analyze missing values in the dataset
         """
-        missing_percentages = (self.df.isnull().sum() / len(self.df) * 100).to_dict()
-        return {k: v for k, v in missing_percentages.items() if v > 0}
+        counts = self._nulls.to_numpy()
+        return {
+            self._nulls.index[i]: float(counts[i] / len(self.df) * 100)
+            for i in np.flatnonzero(counts)
+        }
+
+    def _count_nulls(self) -> pd.Series:
+        """
+        Count missing values per column, using np.isnan on the numeric block
+        """
+        numeric_cols = self._numeric_df.columns
+        other_cols = self.df.columns.difference(numeric_cols, sort=False)
+        numeric_nulls = pd.Series(np.isnan(self._numeric_df.to_numpy()).sum(axis=0),
+                                  index=numeric_cols)
+        other_nulls = self.df[other_cols].isna().sum()
+        return pd.concat([numeric_nulls, other_nulls]).reindex(self.df.columns)
     
-    def _compute_correlations(self) -> Dict[str, Dict[str, float]]:
+    def _compute_correlations(self) -> Dict[str, Any]:
         """
-        Compute correlation matrix for numeric columns
+        Compute correlation matrix for numeric columns, returned as the column
+        names and a NumPy matrix rather than nested dicts
         """
-        numeric_cols = self.df.select_dtypes(include=[np.number]).columns
+        numeric_cols = self._numeric_df.columns
         if len(numeric_cols) > 1:
-            corr_matrix = self.df[numeric_cols].corr().to_dict()
-            return corr_matrix
+            arr = self._numeric_df.to_numpy()
+            complete_rows = ~np.isnan(arr).any(axis=1)
+            if complete_rows.mean() < CORRELATION_MIN_COMPLETE_ROWS:
+                # Too many gaps to drop rows; use pandas' pairwise-complete correlation
+                corr = self._numeric_df.corr().to_numpy()
+            else:
+                corr = self._pearson_gemm(arr[complete_rows])
+            return {"columns": list(numeric_cols), "matrix": corr.astype(np.float32)}
         return {}
     
+    @staticmethod
+    def _pearson_gemm(arr: np.ndarray) -> np.ndarray:
+        """
+        Pearson correlation of NaN-free columns as a single matrix product
+        of the standardized data
+        """
+        n_rows = arr.shape[0]
+        if n_rows < 2:
+            return np.full((arr.shape[1], arr.shape[1]), np.nan)
+        # float32 sums lose the spread of columns with a large offset, so
+        # standardize and multiply in float64 as np.corrcoef does
+        arr = arr.astype(np.float64, copy=False)
+        with np.errstate(divide='ignore', invalid='ignore'):
+            # Constant columns have zero std and yield NaN, as np.corrcoef does
+            X = (arr - arr.mean(axis=0)) / arr.std(axis=0, ddof=1)
+            corr = (X.T @ X) / (n_rows - 1)
+        return np.clip(corr, -1, 1, out=corr)
+
     def _get_column_types(self) -> Dict[str, str]:
         """
         Get column data types
         """
-        return dict(self.df.dtypes.astype(str))
+        if self._dtypes is None:
+            if self._df is None:
+                # Infer types from a sample of rows instead of loading the whole file
+                return dict(self._read_csv_robust(sample_only=True).dtypes.astype(str))
+            return dict(self.df.dtypes.astype(str))
+        return dict(self._dtypes)
     
     def _detect_outliers(self) -> Dict[str, Any]:
         """
         Detect outliers using IQR method
         """
-        numeric_cols = self.df.select_dtypes(include=[np.number]).columns
+        numeric_df = self._numeric_df
         outliers = {}
-        for col in numeric_cols:
-            try:
-                Q1 = self.df[col].quantile(0.25)
-                Q3 = self.df[col].quantile(0.75)
-                IQR = Q3 - Q1
-                lower_bound = Q1 - 1.5 * IQR
-                upper_bound = Q3 + 1.5 * IQR
-                
-                column_outliers = self.df[(self.df[col] < lower_bound) | (self.df[col] > upper_bound)]
-                if not column_outliers.empty:
-                    outliers[col] = {
-                        "total_outliers": len(column_outliers),
-                        "percentage": len(column_outliers) / len(self.df) * 100,
-                        "lower_bound": lower_bound,
-                        "upper_bound": upper_bound
-                    }
-            except Exception as e:
-                print(f"Could not detect outliers for column {col}: {e}")
+        if numeric_df.empty:
+            return outliers
+
+        iqr_kernel = _get_iqr_kernel() if numeric_df.shape[1] >= NUMBA_MIN_COLUMNS else None
+        if iqr_kernel is not None:
+            # Column-major layout keeps each column contiguous for the parallel kernel
+            Q1, Q3, counts = iqr_kernel(np.asfortranarray(numeric_df.to_numpy()))
+            IQR = Q3 - Q1
+            lower_bounds = Q1 - 1.5 * IQR
+            upper_bounds = Q3 + 1.5 * IQR
+        else:
+            # Compute all quartiles in one call and the masks as a single 2D comparison
+            quartiles = numeric_df.quantile([0.25, 0.75]).to_numpy(dtype=np.float64)
+            Q1, Q3 = quartiles[0], quartiles[1]
+            IQR = Q3 - Q1
+            lower_bounds = Q1 - 1.5 * IQR
+            upper_bounds = Q3 + 1.5 * IQR
+
+            values = numeric_df.to_numpy()
+            mask = ((values < lower_bounds.astype(values.dtype))
+                    | (values > upper_bounds.astype(values.dtype)))
+            counts = mask.sum(axis=0)
+
+        for col, count, lower_bound, upper_bound in zip(
+            numeric_df.columns, counts, lower_bounds, upper_bounds
+        ):
+            if count > 0:
+                outliers[col] = {
+                    "total_outliers": int(count),
+                    "percentage": float(count / len(self.df) * 100),
+                    "lower_bound": lower_bound,
+                    "upper_bound": upper_bound
+                }
         return outliers
     
     def visualize_data(self, analysis: Dict[str, Any]):
         """
         Create visualizations based on the analysis
         """
+        # Plotting libraries are slow to import, so load them only when plotting
+        import matplotlib
+        # Plots are only saved to disk, so skip GUI backend initialization
+        matplotlib.use('Agg')
+        import matplotlib.pyplot as plt
+        import seaborn as sns
+
         try:
-            plt.figure(figsize=(12, 8))
+            fig, axes = plt.subplots(2, 2, figsize=(12, 8))
             
             # Correlation Heatmap
             if analysis['correlations']:
-                plt.subplot(2, 2, 1)
-                corr_matrix = pd.DataFrame(analysis['correlations'])
-                sns.heatmap(corr_matrix, annot=True, cmap='coolwarm', center=0, 
-                            square=True, linewidths=0.5)
-                plt.title('Correlation Heatmap')
-                plt.tight_layout()
+                ax = axes[0, 0]
+                correlations = analysis['correlations']
+                sns.heatmap(correlations['matrix'], ax=ax, annot=True, cmap='coolwarm', center=0,
+                            square=True, linewidths=0.5,
+                            xticklabels=correlations['columns'],
+                            yticklabels=correlations['columns'])
+                ax.set_title('Correlation Heatmap')
+            else:
+                axes[0, 0].axis('off')
             
             # Missing Values Bar Chart
             if analysis['missing_values']:
-                plt.subplot(2, 2, 2)
+                ax = axes[0, 1]
                 missing_df = pd.Series(analysis['missing_values'])
-                missing_df.plot(kind='bar')
-                plt.title('Missing Values Percentage')
-                plt.ylabel('Percentage')
-                plt.xticks(rotation=45, ha='right')
+                missing_df.plot(kind='bar', ax=ax)
+                ax.set_title('Missing Values Percentage')
+                ax.set_ylabel('Percentage')
+                plt.setp(ax.get_xticklabels(), rotation=45, ha='right')
+            else:
+                axes[0, 1].axis('off')
             
+            # Plot a random subsample so large datasets don't dominate plotting time
+            numeric_cols = self._numeric_df.columns
+            plot_df = self._numeric_df
+            if len(plot_df) > PLOT_SAMPLE_SIZE:
+                plot_df = plot_df.sample(PLOT_SAMPLE_SIZE, random_state=0)
+
             # Boxplot for Outliers
-            numeric_cols = self.df.select_dtypes(include=[np.number]).columns
             if len(numeric_cols) > 0:
-                plt.subplot(2, 2, 3)
-                self.df[numeric_cols].boxplot()
-                plt.title('Boxplot of Numeric Columns')
-                plt.xticks(rotation=45, ha='right')
+                ax = axes[1, 0]
+                plot_df.boxplot(ax=ax)
+                ax.set_title('Boxplot of Numeric Columns')
+                plt.setp(ax.get_xticklabels(), rotation=45, ha='right')
+            else:
+                axes[1, 0].axis('off')
             
             # Distribution of First Numeric Column
             if len(numeric_cols) > 0:
-                plt.subplot(2, 2, 4)
-                sns.histplot(self.df[numeric_cols[0]], kde=True)
-                plt.title(f'Distribution of {numeric_cols[0]}')
+                ax = axes[1, 1]
+                sns.histplot(plot_df[numeric_cols[0]], kde=True, ax=ax)
+                ax.set_title(f'Distribution of {numeric_cols[0]}')
+            else:
+                axes[1, 1].axis('off')
             
-            plt.tight_layout()
-            plt.savefig(f'{self.dataset_name}/analysis_plots.png')
-            plt.close()
+            fig.tight_layout()
+            fig.savefig(f'{self.dataset_name}/analysis_plots.png')
+            plt.close(fig)
         except Exception as e:
             print(f"Error creating visualizations: {e}")
     
-    @retry(stop=stop_after_attempt(3), wait=wait_exponential(multiplier=1, min=4, max=10))
+    @staticmethod
+    def _top_correlations(correlations: Dict[str, Any],
+                          k: int = PROMPT_TOP_K) -> List[Tuple[str, str, float]]:
+        """
+        Return the k column pairs with the largest absolute correlation, strongest first
+        """
+        if not correlations:
+            return []
+        cols, matrix = correlations['columns'], correlations['matrix']
+        rows, col_idx = np.triu_indices(len(cols), k=1)
+        values = matrix[rows, col_idx].astype(np.float64)
+        # NaN correlations (constant columns) sort last
+        strength = np.nan_to_num(np.abs(values), nan=-1.0)
+        top = np.argpartition(strength, -k)[-k:] if len(values) > k else np.arange(len(values))
+        top = top[np.argsort(-strength[top])]
+        return [(cols[rows[i]], cols[col_idx[i]], float(values[i]))
+                for i in top if not np.isnan(values[i])]
+
+    def _format_correlations(self, correlations: Dict[str, Any]) -> str:
+        """
+        Summarize the strongest correlations for the prompt
+        """
+        top = self._top_correlations(correlations)
+        if not top:
+            return "No correlations between numeric columns"
+        return "; ".join(f"{a} ~ {b}: {value:.2f}" for a, b, value in top)
+
+    def _format_outliers(self, outliers: Dict[str, Any], k: int = PROMPT_TOP_K) -> str:
+        """
+        Summarize the columns with the highest share of outliers for the prompt
+        """
+        if not outliers:
+            return "No outliers detected"
+        top = sorted(outliers.items(), key=lambda item: item[1]['percentage'], reverse=True)[:k]
+        return "; ".join(
+            f"{col}: {info['total_outliers']} outliers ({info['percentage']:.1f}%) "
+            f"outside [{info['lower_bound']:.4g}, {info['upper_bound']:.4g}]"
+            for col, info in top
+        )
+
     def generate_narrative(self, analysis: Dict[str, Any]):
         """
         Generate a narrative using AI Proxy and GPT-4o-Mini
         """
+        from tenacity import Retrying, stop_after_attempt, wait_exponential
+
+        for attempt in Retrying(stop=stop_after_attempt(3),
+                                wait=wait_exponential(multiplier=1, min=4, max=10)):
+            with attempt:
+                self._write_narrative(analysis)
+
+    def _write_narrative(self, analysis: Dict[str, Any]):
+        """
+        Request the narrative from the API and write it to README.md
+        """
+        import requests
+
         narrative_prompt = f"""
         You are a data storyteller. Write a compelling narrative about the dataset named '{self.dataset_name}'.
         
@@ -210,8 +735,8 @@ class DataAnalyzer:
         Column Types: {str(analysis['column_types'])}
 
         Key Findings:
-        1. Correlation Insights: {str(analysis['correlations'])}
-        2. Outlier Analysis: {str(analysis['outliers'])}
+        1. Correlation Insights (strongest pairs): {self._format_correlations(analysis['correlations'])}
+        2. Outlier Analysis (most affected columns): {self._format_outliers(analysis['outliers'])}
 
         Please write a README.md that includes:
         - A brief description of the data
@@ -221,12 +746,8 @@ class DataAnalyzer:
         """
         
         try:
-            response = requests.post(
+            response = self._get_session().post(
                 f"{self.base_url}v1/chat/completions",
-                headers={
-                    "Content-Type": "application/json",
-                    "Authorization": f"Bearer {self.api_key}"
-                },
                 json={
                     "model": "gpt-4o-mini",
                     "messages": [
@@ -234,7 +755,8 @@ class DataAnalyzer:
                         {"role": "user", "content": narrative_prompt}
                     ],
                     "max_tokens": 1000
-                }
+                },
+                timeout=API_TIMEOUT
             )
             
             response.raise_for_status()
@@ -270,11 +792,15 @@ class DataAnalyzer:
 
 def main():
     if len(sys.argv) < 2:
-        print("Usage: python autolysis.py <path_to_csv>")
+        print("Usage: python autolysis.py <path_to_csv> [--column-types]")
         sys.exit(1)
     
     csv_path = sys.argv[1]
     analyzer = DataAnalyzer(csv_path)
+    if "--column-types" in sys.argv[2:]:
+        # Only a sample of rows is read; the full file is never loaded
+        print(json.dumps(analyzer._get_column_types(), indent=2))
+        return
     analyzer.run_analysis()
 
 if __name__ == "__main__":
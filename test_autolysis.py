@@ -0,0 +1,95 @@
+import json
+
+import numpy as np
+import pandas as pd
+
+from autolysis import DataAnalyzer
+
+
+def test_pearson_gemm_matches_corrcoef_on_offset_data():
+    # Prices around 1e6 with cents: float32 centering used to destroy the spread
+    rng = np.random.default_rng(0)
+    price = np.round(1e6 + rng.normal(0, 5, 200_000), 2)
+    other = np.round(1e6 + 0.5 * (price - 1e6) + rng.normal(0, 5, 200_000), 2)
+    arr = np.column_stack([price, other]).astype(np.float32)
+
+    expected = np.corrcoef(arr, rowvar=False)
+    np.testing.assert_allclose(DataAnalyzer._pearson_gemm(arr), expected, atol=1e-6)
+
+
+def test_numeric_frame_keeps_float64_for_small_spread():
+    # 9e6 + N(0, 1) is below 1e7 but float32 would round it to whole numbers
+    rng = np.random.default_rng(0)
+    analyzer = DataAnalyzer.__new__(DataAnalyzer)
+    analyzer.df = pd.DataFrame({"x": 9e6 + rng.normal(0, 1, 10_000),
+                                "y": rng.normal(0, 1, 10_000)})
+
+    numeric_df = analyzer._build_numeric_frame()
+
+    assert (numeric_df.dtypes == np.float64).all()
+    assert abs(numeric_df["x"].std() - analyzer.df["x"].std()) < 1e-9
+
+
+def test_numeric_frame_downcasts_well_scaled_columns():
+    rng = np.random.default_rng(0)
+    analyzer = DataAnalyzer.__new__(DataAnalyzer)
+    analyzer.df = pd.DataFrame({"x": rng.normal(50, 10, 1_000), "const": np.ones(1_000)})
+
+    assert (analyzer._build_numeric_frame().dtypes == np.float32).all()
+
+
+def test_numeric_frame_keeps_float64_for_large_integer_ids():
+    # IDs above 2**24 are not all representable in float32
+    rng = np.random.default_rng(0)
+    ids = rng.integers(0, 40_000_000, 10_000)
+    analyzer = DataAnalyzer.__new__(DataAnalyzer)
+    analyzer.df = pd.DataFrame({"id": ids})
+    analyzer._numeric_df = analyzer._build_numeric_frame()
+
+    summary = analyzer._summarize_numeric()
+
+    assert (analyzer._numeric_df.dtypes == np.float64).all()
+    assert summary["id"]["max"] == ids.max()
+    assert summary["id"]["min"] == ids.min()
+
+
+def test_numeric_frame_keeps_float64_for_large_constant_column():
+    analyzer = DataAnalyzer.__new__(DataAnalyzer)
+    analyzer.df = pd.DataFrame({"const": np.full(1_000, 123456789)})
+    analyzer._numeric_df = analyzer._build_numeric_frame()
+
+    summary = analyzer._summarize_numeric()
+
+    assert (analyzer._numeric_df.dtypes == np.float64).all()
+    assert summary["const"]["min"] == 123456789
+    assert summary["const"]["mean"] == 123456789
+
+
+def test_csv_types_match_pandas(tmp_path, monkeypatch):
+    monkeypatch.setattr("autolysis.ENCODING_CACHE_PATH", str(tmp_path / "cache.json"))
+    csv_path = tmp_path / "ts.csv"
+    csv_path.write_text("ts,a,a,v\n"
+                        "2021-01-01 10:00:00,1,2,3\n"
+                        "2021-01-02 11:30:00,4,5,6\n")
+
+    analysis = DataAnalyzer(str(csv_path)).analyze_dataset()
+
+    column_types = analysis["column_types"]
+    assert list(column_types) == ["ts", "a", "a.1", "v"]
+    assert column_types["ts"] in ("str", "object")
+    assert analysis["basic_stats"]["numeric_columns"] == ["a", "a.1", "v"]
+
+
+def test_encoding_cache_drops_entries_for_older_versions(tmp_path, monkeypatch):
+    cache_path = tmp_path / "cache.json"
+    monkeypatch.setattr("autolysis.ENCODING_CACHE_PATH", str(cache_path))
+    csv_path = tmp_path / "data.csv"
+
+    csv_path.write_text("x\n1\n")
+    DataAnalyzer(str(csv_path)).df
+    csv_path.write_text("x\n1\n2\n")
+    DataAnalyzer(str(csv_path)).df
+
+    cache = json.loads(cache_path.read_text())
+    assert len(cache) == 1
+    assert next(iter(cache)).endswith(f":{csv_path.stat().st_size}")